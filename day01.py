@@ -13,6 +13,16 @@ requires calculating how many complete cycles of 100 the dial makes during each
 rotation, accounting for the starting position and direction of movement.
 """
 
+import json
+import os
+import random
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 def solve_part1(input_text):
     lines = input_text.strip().split("\n")
@@ -69,6 +79,476 @@ def solve_part2(input_text):
     return count_zeros
 
 
+def parse_rotations(input_text):
+    """Parse instructions into signed distances (left is negative)."""
+    rotations = []
+    for line in input_text.strip().split("\n"):
+        distance = int(line[1:])
+        rotations.append(-distance if line[0] == "L" else distance)
+    return rotations
+
+
+def rotate(position, distance):
+    """Apply one signed rotation, returning ``(position, zeros_hit)``."""
+    if distance >= 0:
+        passes = (position + distance) // 100
+    else:
+        passes = (position - 1) // 100 - (position + distance - 1) // 100
+    return (position + distance) % 100, passes
+
+
+def transfer_table(rotations, modulus=100):
+    """Summarize a run of rotations as a function of the start position.
+
+    Returns ``(shift, landings, passes)`` where the run moves any start
+    position ``p`` to ``(p + shift) % modulus``, and ``landings[p]`` /
+    ``passes[p]`` are the Part 1 / Part 2 zero counts when starting from ``p``.
+
+    The table is built in ``O(len(rotations) + modulus)`` rather than by
+    simulating every start. Treating positions as unbounded integers, a right
+    turn of ``d`` from ``x`` hits zero ``floor((x + d) / m) - floor(x / m)``
+    times and a left turn ``floor((x - 1) / m) - floor((x - d - 1) / m)``
+    times (the same counts ``solve_part2`` computes for ``m = 100``). With
+    ``x = p + offset`` each ``floor((p + a) / m)`` term is ``a // m`` plus one
+    for ``p >= m - a % m``, so all starts are covered by a difference array.
+    """
+    hits = [0] * modulus  # how often the run ends a rotation at offset k
+    steps = [0] * (modulus + 1)
+    base = 0
+    offset = 0
+
+    for distance in rotations:
+        if distance >= 0:
+            upper, lower = offset + distance, offset
+        else:
+            upper, lower = offset - 1, offset + distance - 1
+        q, r = divmod(upper, modulus)
+        base += q
+        if r:
+            steps[modulus - r] += 1
+        q, r = divmod(lower, modulus)
+        base -= q
+        if r:
+            steps[modulus - r] -= 1
+        offset = (offset + distance) % modulus
+        hits[offset] += 1
+
+    landings = [hits[-p % modulus] for p in range(modulus)]
+    passes = []
+    running = base
+    for p in range(modulus):
+        running += steps[p]
+        passes.append(running)
+
+    return offset, landings, passes
+
+
+def compose_tables(first, second):
+    """Chain two transfer tables: run ``first`` and then ``second``."""
+    shift1, landings1, passes1 = first
+    shift2, landings2, passes2 = second
+    modulus = len(landings1)
+    landings = []
+    passes = []
+    for p in range(modulus):
+        q = (p + shift1) % modulus
+        landings.append(landings1[p] + landings2[q])
+        passes.append(passes1[p] + passes2[q])
+    return (shift1 + shift2) % modulus, landings, passes
+
+
+def _split_chunks(input_text, num_chunks):
+    """Split the input into roughly equal pieces at line boundaries."""
+    text = input_text.strip()
+    size = len(text)
+    chunks = []
+    start = 0
+    for i in range(1, num_chunks + 1):
+        if start >= size:
+            break
+        end = size if i == num_chunks else text.find("\n", size * i // num_chunks)
+        if end == -1:
+            end = size
+        if end > start:
+            chunks.append(text[start:end])
+        start = end + 1
+    return chunks
+
+
+def _chunk_table(chunk):
+    return transfer_table(parse_rotations(chunk))
+
+
+def solve_parallel(input_text, workers=None, chunks_per_worker=4):
+    """Solve both parts by building per-chunk transfer tables in parallel.
+
+    Every chunk of lines is reduced to a 100-entry transfer table in a worker
+    process and the tables are then chained in input order. Returns
+    ``(part1, part2)`` matching ``solve_part1`` and ``solve_part2``.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import reduce
+
+    workers = workers or os.cpu_count() or 1
+    chunks = _split_chunks(input_text, workers * chunks_per_worker)
+
+    if workers == 1 or len(chunks) == 1:
+        tables = [_chunk_table(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tables = list(executor.map(_chunk_table, chunks))
+
+    _, landings, passes = reduce(compose_tables, tables)
+    return landings[50], passes[50]
+
+
+def _parse_rotations_numpy(input_text):
+    """Parse instructions into a signed int64 array without a per-line loop."""
+    buf = np.frombuffer(input_text.strip().encode(), dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+
+    # Weight every digit by its power of ten within its line, then add up
+    # each line. The direction letter and any stray whitespace weigh zero.
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+    seen = np.cumsum(is_digit)
+    line_of = np.repeat(np.arange(len(starts)), ends - starts + 1)[: len(buf)]
+    exponent = seen[ends - 1][line_of] - seen
+    powers = 10 ** np.arange(19, dtype=np.int64)
+    values = np.where(is_digit, (buf - ord("0")) * powers[exponent], 0)
+    distances = np.add.reduceat(values, starts)
+
+    return np.where(buf[starts] == ord("L"), -distances, distances)
+
+
+def solve_part1_numpy(input_text):
+    """Vectorized ``solve_part1``; falls back to it without NumPy."""
+    if np is None:
+        return solve_part1(input_text)
+
+    positions = (50 + np.cumsum(_parse_rotations_numpy(input_text))) % 100
+    return int(np.count_nonzero(positions == 0))
+
+
+def solve_part2_numpy(input_text):
+    """Vectorized ``solve_part2``; falls back to it without NumPy.
+
+    Uses the unbounded-position form of the zero counts (see
+    ``transfer_table``), which needs no per-row branching on the position.
+    """
+    if np is None:
+        return solve_part2(input_text)
+
+    rotations = _parse_rotations_numpy(input_text)
+    after = 50 + np.cumsum(rotations)
+    before = after - rotations
+    right = rotations >= 0
+    upper = np.where(right, after, before - 1)
+    lower = np.where(right, before, after - 1)
+    return int((upper // 100 - lower // 100).sum())
+
+
+def _transfer_table_numpy(rotations, modulus):
+    """Vectorized ``transfer_table`` over a signed int64 rotation array."""
+    after = np.cumsum(rotations)
+    before = after - rotations
+    right = rotations >= 0
+    upper = np.where(right, after, before - 1)
+    lower = np.where(right, before, after - 1)
+
+    base = int((upper // modulus - lower // modulus).sum())
+    upper_rem = upper % modulus
+    lower_rem = lower % modulus
+    steps = np.bincount(
+        modulus - upper_rem[upper_rem != 0], minlength=modulus + 1
+    ) - np.bincount(modulus - lower_rem[lower_rem != 0], minlength=modulus + 1)
+    passes = base + np.cumsum(steps[:modulus])
+
+    hits = np.bincount(after % modulus, minlength=modulus)
+    landings = hits[-np.arange(modulus) % modulus]
+
+    shift = int(after[-1] % modulus) if len(after) else 0
+    return shift, landings.tolist(), passes.tolist()
+
+
+def solve_batch(input_text, configs):
+    """Solve both parts for many ``(modulus, start)`` dial configurations.
+
+    The instructions are parsed once and one transfer table is built per
+    distinct modulus, which answers every start position of that dial size
+    at once. Returns a list of ``(part1, part2)`` in the order of ``configs``.
+    """
+    configs = list(configs)
+    if np is not None:
+        rotations = _parse_rotations_numpy(input_text)
+        build = _transfer_table_numpy
+    else:
+        rotations = parse_rotations(input_text)
+        build = transfer_table
+
+    tables = {}
+    results = []
+    for modulus, start in configs:
+        if modulus not in tables:
+            tables[modulus] = build(rotations, modulus)
+        _, landings, passes = tables[modulus]
+        results.append((landings[start % modulus], passes[start % modulus]))
+    return results
+
+
+class _Node:
+    __slots__ = ("rotation", "left", "right", "size", "table")
+
+    def __init__(self, rotation, left=None, right=None):
+        self.rotation = rotation
+        self.left = left
+        self.right = right
+        self.update()
+
+    def update(self):
+        table = transfer_table([self.rotation])
+        size = 1
+        if self.left is not None:
+            table = compose_tables(self.left.table, table)
+            size += self.left.size
+        if self.right is not None:
+            table = compose_tables(table, self.right.table)
+            size += self.right.size
+        self.table = table
+        self.size = size
+        return self
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _build(rotations, lo, hi):
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    return _Node(
+        rotations[mid], _build(rotations, lo, mid), _build(rotations, mid + 1, hi)
+    )
+
+
+def _merge(left, right):
+    # Picking the root with probability proportional to subtree size keeps
+    # the tree balanced in expectation without storing treap priorities.
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if random.randrange(left.size + right.size) < left.size:
+        left.right = _merge(left.right, right)
+        return left.update()
+    right.left = _merge(left, right.left)
+    return right.update()
+
+
+def _split(node, index):
+    """Split into the first ``index`` rotations and the rest."""
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if index <= left_size:
+        first, node.left = _split(node.left, index)
+        return first, node.update()
+    node.right, rest = _split(node.right, index - left_size - 1)
+    return node.update(), rest
+
+
+def _apply_range(node, offset, start, end, state):
+    """Apply the rotations of ``node`` that fall into ``[start, end)``.
+
+    ``state`` is ``[position, landings, passes]`` and is updated in place.
+    Subtrees that are fully covered are applied through their cached table.
+    """
+    if node is None or offset + node.size <= start or end <= offset:
+        return
+    position = state[0]
+    if start <= offset and offset + node.size <= end:
+        shift, landings, passes = node.table
+        state[0] = (position + shift) % 100
+        state[1] += landings[position]
+        state[2] += passes[position]
+        return
+
+    _apply_range(node.left, offset, start, end, state)
+    index = offset + _size(node.left)
+    if start <= index < end:
+        position, passes = rotate(state[0], node.rotation)
+        state[0] = position
+        state[1] += position == 0
+        state[2] += passes
+    _apply_range(node.right, index + 1, start, end, state)
+
+
+class RotationLog:
+    """Editable list of rotations answering range queries in ``O(log n)``.
+
+    Every node of the (implicitly keyed, randomly balanced) tree caches the
+    transfer table of its subtree, so edits only recompute the tables on one
+    root-to-leaf path and queries combine ``O(log n)`` cached tables.
+    """
+
+    def __init__(self, rotations=()):
+        rotations = list(rotations)
+        self.root = _build(rotations, 0, len(rotations))
+
+    @classmethod
+    def from_text(cls, input_text):
+        return cls(parse_rotations(input_text))
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __getitem__(self, index):
+        node = self.root
+        index = self._check_index(index, len(self))
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.rotation
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def _check_index(self, index, limit):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < limit:
+            raise IndexError("rotation index out of range")
+        return index
+
+    def replace(self, index, rotation):
+        """Replace the rotation at ``index`` (signed, left is negative)."""
+        index = self._check_index(index, len(self))
+        path = []
+        node = self.root
+        while True:
+            path.append(node)
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                break
+            else:
+                index -= left_size + 1
+                node = node.right
+        node.rotation = rotation
+        for node in reversed(path):
+            node.update()
+
+    def insert(self, index, rotation):
+        """Insert a rotation so that it ends up at ``index``."""
+        index = self._check_index(index, len(self) + 1)
+        first, rest = _split(self.root, index)
+        self.root = _merge(_merge(first, _Node(rotation)), rest)
+
+    def delete(self, index):
+        """Remove the rotation at ``index``."""
+        index = self._check_index(index, len(self))
+        first, rest = _split(self.root, index)
+        _, rest = _split(rest, 1)
+        self.root = _merge(first, rest)
+
+    def run(self, start, end, position=50):
+        """Apply rotations ``[start, end)`` from ``position``.
+
+        Returns ``(position, landings, passes)`` where the counts follow the
+        Part 1 and Part 2 rules respectively.
+        """
+        if not 0 <= start <= end <= len(self):
+            raise IndexError("rotation range out of range")
+        position %= 100
+        state = [position, 0, 0]
+        _apply_range(self.root, 0, start, end, state)
+        return tuple(state)
+
+    def zeros_hit(self, start, end, position=50):
+        """Count Part 2 zeros hit by rotations ``[start, end)``."""
+        return self.run(start, end, position)[2]
+
+
+class DialStream:
+    """Single-pass consumer that updates both part counters line by line.
+
+    Lines can come from any iterable, a file object or a raw file descriptor,
+    and only the current line is held in memory. With ``checkpoint_path`` set,
+    the state is written every ``checkpoint_every`` lines so a restarted
+    consumer (see ``resume``) can pick up where the previous one stopped.
+    """
+
+    def __init__(self, position=50, checkpoint_path=None, checkpoint_every=1_000_000):
+        self.line_number = 0
+        self.position = position
+        self.part1 = 0
+        self.part2 = 0
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+
+    @classmethod
+    def resume(cls, checkpoint_path, checkpoint_every=1_000_000):
+        """Restore a stream from its last checkpoint, or start fresh."""
+        stream = cls(checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every)
+        try:
+            with open(checkpoint_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return stream
+        stream.line_number = state["line_number"]
+        stream.position = state["position"]
+        stream.part1 = state["part1"]
+        stream.part2 = state["part2"]
+        return stream
+
+    def feed(self, line):
+        """Process one instruction line (blank lines are skipped)."""
+        self.line_number += 1
+        line = line.strip()
+        if line:
+            distance = int(line[1:])
+            if line[0] == "L":
+                distance = -distance
+            self.position, passes = rotate(self.position, distance)
+            self.part1 += self.position == 0
+            self.part2 += passes
+        if self.checkpoint_path and self.line_number % self.checkpoint_every == 0:
+            self.checkpoint()
+
+    def consume(self, source):
+        """Feed all lines of ``source`` and return ``(part1, part2)``.
+
+        Lines before ``line_number`` are skipped, so the same source can be
+        passed again after resuming from a checkpoint.
+        """
+        if isinstance(source, int):
+            with open(source, closefd=False) as f:
+                return self.consume(f)
+        for line in islice(source, self.line_number, None):
+            self.feed(line)
+        if self.checkpoint_path:
+            self.checkpoint()
+        return self.part1, self.part2
+
+    def checkpoint(self):
+        """Atomically write the current state to ``checkpoint_path``."""
+        state = {
+            "line_number": self.line_number,
+            "position": self.position,
+            "part1": self.part1,
+            "part2": self.part2,
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+
 if __name__ == "__main__":
     import sys
 
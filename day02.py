@@ -6,39 +6,55 @@ Given a series of numeric ranges, the task is to find all numbers within those r
 that can be formed by repeating a sequence of digits multiple times.
 
 Part 1 focuses on numbers with exactly 2 repetitions: a number is invalid if it can
-be expressed as a pattern repeated exactly twice (e.g., 11, 6464, 123123). The
-algorithm generates candidates by iterating through possible pattern lengths, creating
-all valid patterns (excluding those with leading zeros), and checking if the resulting
-repeated number falls within each range.
-
-Part 2 extends the criteria to numbers with 2 or more repetitions: any number that
-can be formed by repeating a pattern at least twice is invalid (e.g., 111, 12341234,
-1212121212). This requires checking multiple divisors of the number's digit length
-to find all possible pattern lengths that evenly divide the total length. The solution
-sums all unique invalid numbers found across all ranges.
+be expressed as a pattern repeated exactly twice (e.g., 11, 6464, 123123). Part 2
+extends the criteria to numbers with 2 or more repetitions (e.g., 111, 12341234,
+1212121212), so every pattern length that evenly divides the digit length counts.
+
+Neither part enumerates candidates. For a fixed digit length and pattern length the
+invalid numbers are ``pattern * repunit`` (e.g. 123123 = 123 * 1001), so the ones
+inside a range come from one contiguous interval of patterns and their sum is an
+arithmetic series. Part 1 only needs the pattern length of half the digits. Part 2
+has to count numbers that repeat with several pattern lengths (1111 is both "1" and
+"11" repeated) only once, which is done with Möbius inclusion-exclusion over the
+divisors of the digit length.
 """
 
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+
 
-def generate_invalid_ids_part1_in_range(start, end):
-    """Generate all Part 1 invalid IDs (exactly 2 repetitions) in range."""
-    start_digits = len(str(start))
-    end_digits = len(str(end))
-    invalid_ids = set()
+def repeated_ids_in_range(start, end, num_digits, pattern_len):
+    """Count and sum IDs in range made of one pattern repeated to num_digits.
 
-    for num_digits in range(start_digits, end_digits + 1):
-        if num_digits % 2 == 0:  # Must be even for 2 repetitions
-            pattern_len = num_digits // 2
+    Every such ID is ``pattern * repunit`` with
+    ``repunit = (10**num_digits - 1) // (10**pattern_len - 1)`` (e.g.
+    ``123123 = 123 * 1001``), so the IDs inside ``[start, end]`` come from one
+    contiguous interval of patterns and their sum is an arithmetic series.
+    """
+    repunit = (10**num_digits - 1) // (10**pattern_len - 1)
+    lo = max(start, 10 ** (num_digits - 1))
+    hi = min(end, 10**num_digits - 1)
 
-            # Generate all patterns of this length
-            pattern_min = 10 ** (pattern_len - 1)  # No leading zeros
-            pattern_max = 10**pattern_len - 1
+    first = max(-(-lo // repunit), 10 ** (pattern_len - 1))
+    last = min(hi // repunit, 10**pattern_len - 1)
+    if first > last:
+        return 0, 0
 
-            for pattern in range(pattern_min, pattern_max + 1):
-                invalid_num = int(str(pattern) * 2)
-                if start <= invalid_num <= end:
-                    invalid_ids.add(invalid_num)
+    count = last - first + 1
+    return count, repunit * (first + last) * count // 2
 
-    return invalid_ids
+
+def sum_invalid_ids_part1_in_range(start, end):
+    """Sum all Part 1 invalid IDs (exactly 2 repetitions) in range."""
+    total = 0
+    for num_digits in range(len(str(start)), len(str(end)) + 1):
+        if num_digits % 2 == 0:
+            total += repeated_ids_in_range(start, end, num_digits, num_digits // 2)[1]
+    return total
 
 
 def solve_part1(input_text):
@@ -48,37 +64,46 @@ def solve_part1(input_text):
 
     for range_str in ranges:
         start, end = map(int, range_str.split("-"))
-        invalid_ids = generate_invalid_ids_part1_in_range(start, end)
-        total += sum(invalid_ids)
+        total += sum_invalid_ids_part1_in_range(start, end)
 
     return total
 
 
-def generate_invalid_ids_in_range(start, end):
-    """Generate all invalid IDs (2+ repetitions) in range."""
-    start_digits = len(str(start))
-    end_digits = len(str(end))
-    invalid_ids = set()
-
-    for num_digits in range(start_digits, end_digits + 1):
-        for pattern_len in range(1, num_digits // 2 + 1):
-            if num_digits % pattern_len == 0:
-                repetitions = num_digits // pattern_len
-
-                # Generate all patterns of this length
-                pattern_min = 10 ** (pattern_len - 1) if pattern_len > 1 else 1
-                pattern_max = 10**pattern_len - 1
+def mobius(n):
+    """Return the Möbius function of n."""
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    if n > 1:
+        result = -result
+    return result
 
-                for pattern in range(pattern_min, pattern_max + 1):
-                    pattern_str = str(pattern)
-                    if len(pattern_str) != pattern_len:
-                        continue
 
-                    invalid_num = int(pattern_str * repetitions)
-                    if start <= invalid_num <= end:
-                        invalid_ids.add(invalid_num)
+def sum_invalid_ids_in_range(start, end):
+    """Sum all invalid IDs (2+ repetitions) in range without enumerating them.
 
-    return invalid_ids
+    An ID with pattern length ``d`` also has every multiple of ``d`` dividing
+    the digit count as a pattern length, so the union over proper divisors is
+    counted once via Möbius inclusion-exclusion: the IDs for pattern length
+    ``d`` contribute with weight ``-mobius(num_digits // d)``.
+    """
+    total = 0
+    for num_digits in range(len(str(start)), len(str(end)) + 1):
+        for pattern_len in range(1, num_digits // 2 + 1):
+            if num_digits % pattern_len == 0:
+                weight = -mobius(num_digits // pattern_len)
+                if weight:
+                    _, pattern_sum = repeated_ids_in_range(
+                        start, end, num_digits, pattern_len
+                    )
+                    total += weight * pattern_sum
+    return total
 
 
 def solve_part2(input_text):
@@ -88,12 +113,255 @@ def solve_part2(input_text):
 
     for range_str in ranges:
         start, end = map(int, range_str.split("-"))
-        invalid_ids = generate_invalid_ids_in_range(start, end)
-        total += sum(invalid_ids)
+        total += sum_invalid_ids_in_range(start, end)
 
     return total
 
 
+def period_histogram(start, end):
+    """Break down the invalid IDs in range by their minimal period.
+
+    Returns ``{(pattern_len, repetitions): (count, sum)}`` where every invalid
+    ID is attributed to its shortest repeating pattern only (``1111`` counts as
+    ``(1, 4)``, not ``(2, 2)``). The IDs whose minimal pattern length is ``q``
+    are obtained by Möbius inversion over the pattern lengths dividing ``q``.
+    The counts and sums over all entries equal the Part 2 answer.
+    """
+    histogram = {}
+    for num_digits in range(len(str(start)), len(str(end)) + 1):
+        periodic = {}
+        for pattern_len in range(1, num_digits // 2 + 1):
+            if num_digits % pattern_len == 0:
+                periodic[pattern_len] = repeated_ids_in_range(
+                    start, end, num_digits, pattern_len
+                )
+
+        for pattern_len in periodic:
+            count = total = 0
+            for divisor, (divisor_count, divisor_sum) in periodic.items():
+                if pattern_len % divisor == 0:
+                    weight = mobius(pattern_len // divisor)
+                    count += weight * divisor_count
+                    total += weight * divisor_sum
+            if count:
+                histogram[(pattern_len, num_digits // pattern_len)] = (count, total)
+    return histogram
+
+
+def solve_histograms(input_text):
+    """Return the ``period_histogram`` of every range in input order."""
+    return [period_histogram(start, end) for start, end in parse_ranges(input_text)]
+
+
+def parse_ranges(input_text):
+    """Parse the comma-separated ranges into (start, end) tuples."""
+    return [
+        tuple(map(int, range_str.split("-")))
+        for range_str in input_text.strip().split(",")
+    ]
+
+
+def merge_ranges(ranges):
+    """Merge overlapping and adjacent ranges into a sorted disjoint list."""
+    if not ranges:
+        return []
+
+    sorted_ranges = sorted(ranges)
+    merged = [sorted_ranges[0]]
+
+    for start, end in sorted_ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def sum_over_ranges(ranges, sum_in_range, union=True):
+    """Apply a per-range sum over many possibly overlapping ranges.
+
+    With ``union=True`` every ID covered by any range counts once. Otherwise
+    the result matches summing every range independently (IDs in overlaps
+    count once per covering range), but each stretch between range endpoints
+    is still evaluated only once and weighted by how many ranges cover it.
+    """
+    if union:
+        return sum(sum_in_range(start, end) for start, end in merge_ranges(ranges))
+
+    changes = {}
+    for start, end in ranges:
+        changes[start] = changes.get(start, 0) + 1
+        changes[end + 1] = changes.get(end + 1, 0) - 1
+
+    total = 0
+    coverage = 0
+    points = sorted(changes)
+    for point, next_point in zip(points, points[1:]):
+        coverage += changes[point]
+        if coverage:
+            total += coverage * sum_in_range(point, next_point - 1)
+    return total
+
+
+def solve_batch(input_text, union=True):
+    """Solve both parts over the sorted and merged ranges.
+
+    Returns ``(part1, part2)``. With ``union=False`` the answers equal
+    ``solve_part1`` and ``solve_part2``; with ``union=True`` IDs covered by
+    several ranges are only counted once.
+    """
+    ranges = parse_ranges(input_text)
+    return (
+        sum_over_ranges(ranges, sum_invalid_ids_part1_in_range, union),
+        sum_over_ranges(ranges, sum_invalid_ids_in_range, union),
+    )
+
+
+# Index file layout (native byte order): header, then for Part 1 and Part 2 the
+# sorted IDs followed by the low and high 64-bit words of their prefix sums.
+_INDEX_MAGIC = b"AOC25D02"
+_INDEX_HEADER = struct.Struct("=8sQQQ")
+_MAX_INDEX_DIGITS = 19  # largest digit count that fits an unsigned 64-bit ID
+
+
+def _invalid_ids_of_length(num_digits, part1):
+    """Return the sorted invalid IDs with exactly num_digits digits."""
+    if part1:
+        if num_digits % 2:
+            return []
+        pattern_lens = [num_digits // 2]
+    else:
+        pattern_lens = [p for p in range(1, num_digits) if num_digits % p == 0]
+
+    ids = set()
+    for pattern_len in pattern_lens:
+        repunit = (10**num_digits - 1) // (10**pattern_len - 1)
+        for pattern in range(10 ** (pattern_len - 1), 10**pattern_len):
+            ids.add(pattern * repunit)
+    return sorted(ids)
+
+
+def build_index(path, max_digits=12):
+    """Write every Part 1 and Part 2 invalid ID up to max_digits to path.
+
+    The file holds the sorted IDs of both parts together with prefix sums so
+    that ``InvalidIdIndex`` can answer range sums with two bisects. Prefix
+    sums may exceed 64 bits and are stored as separate low/high word arrays.
+    """
+    if not 1 <= max_digits <= _MAX_INDEX_DIGITS:
+        raise ValueError(f"max_digits must be between 1 and {_MAX_INDEX_DIGITS}")
+
+    sections = []
+    for part1 in (True, False):
+        ids = array("Q")
+        prefix_lo = array("Q", [0])
+        prefix_hi = array("Q", [0])
+        total = 0
+        for num_digits in range(1, max_digits + 1):
+            for invalid_id in _invalid_ids_of_length(num_digits, part1):
+                ids.append(invalid_id)
+                total += invalid_id
+                prefix_lo.append(total & 0xFFFFFFFFFFFFFFFF)
+                prefix_hi.append(total >> 64)
+        sections.append((ids, prefix_lo, prefix_hi))
+
+    # Write to a unique file next to path and rename it into place, so an
+    # interrupted build never leaves a partial index behind.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                _INDEX_HEADER.pack(
+                    _INDEX_MAGIC, max_digits, len(sections[0][0]), len(sections[1][0])
+                )
+            )
+            for section in sections:
+                for values in section:
+                    values.tofile(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class InvalidIdIndex:
+    """Memory-mapped view of an index file written by ``build_index``.
+
+    Opening the index maps the file without copying or recomputing anything;
+    each range query is two bisects over the mapped ID arrays.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = count1 = count2 = None
+        if len(self._mmap) >= _INDEX_HEADER.size:
+            magic, self.max_digits, count1, count2 = _INDEX_HEADER.unpack_from(
+                self._mmap
+            )
+        if magic != _INDEX_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a day02 index file")
+        if len(self._mmap) != _INDEX_HEADER.size + (3 * (count1 + count2) + 4) * 8:
+            self._mmap.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+
+        self._views = []
+        self._sections = []
+        offset = _INDEX_HEADER.size
+        for count in (count1, count2):
+            section = []
+            for length in (count, count + 1, count + 1):
+                view = memoryview(self._mmap)[offset : offset + length * 8].cast("Q")
+                self._views.append(view)
+                section.append(view)
+                offset += length * 8
+            self._sections.append(section)
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _sum(self, section, start, end):
+        if end >= 10**self.max_digits:
+            raise ValueError(f"range exceeds the indexed {self.max_digits} digits")
+        ids, prefix_lo, prefix_hi = self._sections[section]
+        i = bisect_left(ids, start)
+        j = bisect_right(ids, end)
+        if i >= j:
+            return 0
+        return ((prefix_hi[j] - prefix_hi[i]) << 64) + prefix_lo[j] - prefix_lo[i]
+
+    def sum_part1(self, start, end):
+        """Sum all Part 1 invalid IDs in range."""
+        return self._sum(0, start, end)
+
+    def sum_part2(self, start, end):
+        """Sum all Part 2 invalid IDs in range."""
+        return self._sum(1, start, end)
+
+    def solve_part1(self, input_text):
+        return sum(
+            self.sum_part1(*map(int, range_str.split("-")))
+            for range_str in input_text.strip().split(",")
+        )
+
+    def solve_part2(self, input_text):
+        return sum(
+            self.sum_part2(*map(int, range_str.split("-")))
+            for range_str in input_text.strip().split(",")
+        )
+
+
 if __name__ == "__main__":
     import sys
 
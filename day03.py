@@ -4,30 +4,133 @@ This puzzle involves selecting digits from sequences to maximize numeric values.
 Each line of input represents a sequence of single-digit numbers (1-9).
 
 Part 1 requires selecting exactly 2 digits from each sequence (maintaining their
-relative order) to form the largest possible 2-digit number. The solution uses
-a brute-force approach, checking all pairs of positions (i, j) where i < j,
-computing the resulting 2-digit number, and finding the maximum.
+relative order) to form the largest possible 2-digit number.
 
 Part 2 extends this to selecting exactly 12 digits from each sequence to form
-the largest possible 12-digit number. This is solved using a greedy algorithm:
-at each position in the result, select the largest available digit from the
-remaining valid range, ensuring enough digits remain to complete the selection.
-The algorithm maintains a sliding window constraint - for each of the 12 positions
-being filled, it identifies the rightmost position from which a digit can be
-selected while still leaving enough digits for the remaining positions.
+the largest possible 12-digit number. Both parts are the same greedy problem: at
+each position in the result, select the largest available digit while leaving
+enough digits to complete the selection. Instead of rescanning a window per pick,
+``max_subsequence`` keeps a monotonic stack: each new digit evicts smaller digits
+before it as long as enough digits remain, which makes it O(n) for any number of
+selected digits.
 """
 
+import mmap
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def select_digits(digits, n, k):
+    """Pick the largest subsequence of k items from an iterable of n digits.
+
+    Works on any iterable of comparable digits (characters or byte values)
+    and keeps at most k of them. A digit pops smaller digits off the stack
+    while there are drops left (``n - k`` in total); once the stack is full
+    any digit that cannot improve it is dropped right away.
+    """
+    drops = n - k
+    if drops < 0:
+        raise ValueError(f"cannot select {k} digits from {n}")
+
+    stack = []
+    for digit in digits:
+        while drops and stack and stack[-1] < digit:
+            stack.pop()
+            drops -= 1
+        if len(stack) < k:
+            stack.append(digit)
+        else:
+            drops -= 1
+    return stack
+
+
+def select_digits_many(chunks, n, ks):
+    """Run ``select_digits`` for several ks in a single pass over the input.
+
+    ``chunks`` yields consecutive pieces of the n digits. Every chunk is fed
+    to one capped stack per k before the next chunk is read, so the input is
+    consumed only once and memory stays ``O(chunk + sum(ks))``. Returns the
+    stacks in the order of ``ks``.
+    """
+    for k in ks:
+        if k > n:
+            raise ValueError(f"cannot select {k} digits from {n}")
+
+    stacks = [[] for _ in ks]
+    drops = [n - k for k in ks]
+    for chunk in chunks:
+        for i, k in enumerate(ks):
+            stack = stacks[i]
+            left = drops[i]
+            for digit in chunk:
+                while left and stack and stack[-1] < digit:
+                    stack.pop()
+                    left -= 1
+                if len(stack) < k:
+                    stack.append(digit)
+                else:
+                    left -= 1
+            drops[i] = left
+    return stacks
+
+
+def max_subsequence(line, k):
+    """Return the largest k-digit subsequence of line as a string."""
+    return "".join(select_digits(line, len(line), k))
+
+
+class BankIndex:
+    """Next-occurrence index of one bank for answering many selections.
+
+    ``next[d][i]`` is the first position ``>= i`` holding digit ``d`` (or the
+    bank length if there is none). Building it costs ``O(10 * n)`` once; after
+    that every ``max_subsequence(k)`` query only probes at most 10 digits per
+    selected position, independent of the bank length.
+    """
+
+    def __init__(self, line):
+        n = len(line)
+        self.n = n
+        self.next = []
+        for digit in "0123456789":
+            table = array("q", [n]) * (n + 1)
+            start = 0
+            pos = line.find(digit)
+            while pos != -1:
+                table[start : pos + 1] = array("q", [pos]) * (pos + 1 - start)
+                start = pos + 1
+                pos = line.find(digit, start)
+            self.next.append(table)
+
+    def max_subsequence(self, k):
+        """Return the largest k-digit subsequence of the bank as a string."""
+        n = self.n
+        if k > n:
+            raise ValueError(f"cannot select {k} digits from {n}")
+
+        result = []
+        start = 0
+        for remaining in range(k, 0, -1):
+            limit = n - remaining
+            for digit in range(9, -1, -1):
+                pos = self.next[digit][start]
+                if pos <= limit:
+                    break
+            result.append(str(digit))
+            start = pos + 1
+        return "".join(result)
+
 
 def solve_part1(input_text):
     total = 0
     for line in input_text.strip().split("\n"):
         # Find maximum two-digit number by selecting any two digits in order
-        max_joltage = 0
-        for i in range(len(line)):
-            for j in range(i + 1, len(line)):
-                joltage = int(line[i]) * 10 + int(line[j])
-                max_joltage = max(max_joltage, joltage)
-        total += max_joltage
+        total += int(max_subsequence(line, 2))
     return total
 
 
@@ -35,29 +138,196 @@ def solve_part2(input_text):
     total = 0
     for line in input_text.strip().split("\n"):
         # Select 12 digits to maximize the 12-digit number
-        # Greedy: at each position, pick the largest digit available
-        n = len(line)
-        result = []
-        start = 0
-        remaining = 12
-
-        while remaining > 0:
-            # Can pick from start to (n - remaining) inclusive
-            end = n - remaining
-            # Find max digit in range [start, end]
-            best_idx = start
-            for i in range(start, end + 1):
-                if line[i] > line[best_idx]:
-                    best_idx = i
-            result.append(line[best_idx])
-            start = best_idx + 1
-            remaining -= 1
-
-        joltage = int("".join(result))
-        total += joltage
+        total += int(max_subsequence(line, 12))
     return total
 
 
+def _load_banks_numpy(input_text):
+    """Load equal-length banks as a (lines x length) int8 digit matrix.
+
+    Returns ``None`` if the lines do not all have the same length.
+    """
+    text = input_text.strip() + "\n"
+    width = text.index("\n") + 1
+    buf = np.frombuffer(text.encode(), dtype=np.uint8)
+    if len(buf) % width:
+        return None
+    rows = buf.reshape(-1, width)
+    if not (rows[:, -1] == ord("\n")).all():
+        return None
+    return (rows[:, :-1] - ord("0")).astype(np.int8)
+
+
+def max_subsequences_numpy(banks, k):
+    """Select the largest k-digit value of every row of a digit matrix.
+
+    Runs the greedy pick for all banks at once: each of the k steps takes a
+    row-wise argmax over the window that still leaves enough digits, with
+    positions before each row's previous pick masked out. Returns an int64
+    array of the selected values.
+    """
+    if k > 18:
+        raise ValueError("values with more than 18 digits do not fit into int64")
+    num_banks, n = banks.shape
+    if k > n:
+        raise ValueError(f"cannot select {k} digits from {n}")
+
+    rows = np.arange(num_banks)
+    columns = np.arange(n)
+    start = np.zeros(num_banks, dtype=np.intp)
+    values = np.zeros(num_banks, dtype=np.int64)
+    for remaining in range(k, 0, -1):
+        end = n - remaining + 1
+        window = np.where(columns[:end] >= start[:, None], banks[:, :end], -1)
+        best = window.argmax(axis=1)
+        values = values * 10 + banks[rows, best]
+        start = best + 1
+    return values
+
+
+def _solve_numpy(input_text, k, fallback):
+    if np is None:
+        return fallback(input_text)
+    banks = _load_banks_numpy(input_text)
+    if banks is None:
+        return fallback(input_text)
+    # Sum as Python ints so that millions of large values cannot overflow.
+    return sum(max_subsequences_numpy(banks, k).tolist())
+
+
+def solve_part1_numpy(input_text):
+    """Vectorized ``solve_part1`` for inputs whose banks have equal length."""
+    return _solve_numpy(input_text, 2, solve_part1)
+
+
+def solve_part2_numpy(input_text):
+    """Vectorized ``solve_part2`` for inputs whose banks have equal length."""
+    return _solve_numpy(input_text, 12, solve_part2)
+
+
+def _bank_bounds(data, start, stop):
+    """Yield ``(start, end)`` of every non-empty line starting in [start, stop)."""
+    size = len(data)
+    pos = start
+    while pos < stop:
+        newline = data.find(b"\n", pos)
+        if newline == -1:
+            newline = size
+        end = newline
+        if end > pos and data[end - 1] == ord("\r"):
+            end -= 1
+        if end > pos:
+            yield pos, end
+        pos = newline + 1
+
+
+def _bank_chunks(data, start, end, chunk_size):
+    """Yield ``data[start:end]`` in pieces of at most chunk_size bytes."""
+    for pos in range(start, end, chunk_size):
+        yield data[pos : min(pos + chunk_size, end)]
+
+
+# Stay below the interpreter's int/str conversion limit (4300 digits).
+_INT_DIGITS = 4000
+
+
+def _digits_value(digits):
+    """Turn a list of ASCII digit bytes into an int of any length."""
+    if len(digits) <= _INT_DIGITS:
+        return int(bytes(digits))
+    mid = len(digits) // 2
+    low = len(digits) - mid
+    return _digits_value(digits[:mid]) * 10**low + _digits_value(digits[mid:])
+
+
+def _check_ks(ks):
+    for k in ks:
+        if not isinstance(k, int) or k < 1:
+            raise ValueError(f"cannot select {k!r} digits")
+
+
+def _sum_banks(data, start, stop, ks, chunk_size):
+    totals = [0] * len(ks)
+    for bank_start, bank_end in _bank_bounds(data, start, stop):
+        n = bank_end - bank_start
+        chunks = _bank_chunks(data, bank_start, bank_end, chunk_size)
+        for i, stack in enumerate(select_digits_many(chunks, n, ks)):
+            totals[i] += _digits_value(stack)
+    return totals
+
+
+def solve_file(path, ks=(2, 12), chunk_size=1 << 20):
+    """Sum the best selections for every k over a file in bounded memory.
+
+    The file is memory-mapped and every bank is streamed once through
+    ``select_digits_many`` in ``chunk_size`` pieces, so only ``O(k)`` digits per
+    bank are held at a time no matter how long a line is. Returns one sum per
+    entry of ``ks``; the defaults give ``(part1, part2)``.
+    """
+    _check_ks(ks)
+    if os.path.getsize(path) == 0:
+        return (0,) * len(ks)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return tuple(_sum_banks(data, 0, len(data), ks, chunk_size))
+
+
+def _shard_bounds(path, num_shards):
+    """Split a file into byte ranges that start at line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = []
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            for i in range(1, num_shards + 1):
+                if start >= size:
+                    break
+                stop = (
+                    size
+                    if i == num_shards
+                    else data.find(b"\n", size * i // num_shards)
+                )
+                stop = size if stop == -1 else stop + 1
+                if stop > start:
+                    bounds.append((start, stop))
+                start = stop
+    return bounds
+
+
+def _solve_shard(path, start, stop, ks, chunk_size):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _sum_banks(data, start, stop, ks, chunk_size)
+
+
+def solve_sharded(path, workers=None, ks=(2, 12), chunk_size=1 << 20):
+    """Like ``solve_file``, but solves byte-offset shards in worker processes.
+
+    The parent only computes shard boundaries; every worker maps the file on
+    its own and returns partial sums, so no input text is pickled.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    _check_ks(ks)
+    workers = workers or os.cpu_count() or 1
+    bounds = _shard_bounds(path, workers * 4)
+    if not bounds:
+        return (0,) * len(ks)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_solve_shard, path, start, stop, ks, chunk_size)
+            for start, stop in bounds
+        ]
+        totals = [0] * len(ks)
+        for future in futures:
+            for i, partial in enumerate(future.result()):
+                totals[i] += partial
+    return tuple(totals)
+
+
 if __name__ == "__main__":
     import sys
 
@@ -16,6 +16,17 @@ concepts where the state of cells depends on their neighbors and evolves over di
 time steps.
 """
 
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 def solve_part1(input_text):
     grid = input_text.strip().split("\n")
@@ -79,6 +90,480 @@ def solve_part2(input_text):
     return total_removed
 
 
+def _padded_grid(input_text):
+    """Return the grid as a flat bytearray (1 for a roll) and its row width.
+
+    The grid is surrounded by a one-cell border of empty cells so that the
+    neighbours of every real cell are valid indices.
+    """
+    lines = input_text.strip().split("\n")
+    width = len(lines[0]) + 2
+    cells = bytearray(width * (len(lines) + 2))
+    for r, line in enumerate(lines, 1):
+        row = bytes(1 if ch == "@" else 0 for ch in line)
+        cells[r * width + 1 : r * width + 1 + len(row)] = row
+    return cells, width
+
+
+def _removal_rounds(cells, width):
+    """Yield the cells removed in each round of the Part 2 cascade.
+
+    Neighbour counts are computed once. Afterwards only the neighbours of
+    removed rolls are decremented, and a roll whose count drops below 4 is
+    queued for the next round, so the whole cascade runs in ``O(cells)``.
+    All rolls of a round are removed before any counts change, which keeps
+    the "remove everything accessible at once" semantics of ``solve_part2``.
+    """
+    offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+    counts = bytearray(len(cells))
+    frontier = []
+    for i, cell in enumerate(cells):
+        if cell:
+            count = 0
+            for offset in offsets:
+                count += cells[i + offset]
+            counts[i] = count
+            if count < 4:
+                frontier.append(i)
+
+    while frontier:
+        for i in frontier:
+            cells[i] = 0
+        yield frontier
+
+        next_frontier = []
+        for i in frontier:
+            for offset in offsets:
+                j = i + offset
+                if cells[j]:
+                    counts[j] -= 1
+                    # Only the decrement from 4 to 3 makes a roll accessible,
+                    # so every roll is queued at most once.
+                    if counts[j] == 3:
+                        next_frontier.append(j)
+        frontier = next_frontier
+
+
+def solve_part2_worklist(input_text):
+    """Same result as ``solve_part2`` using the worklist cascade."""
+    cells, width = _padded_grid(input_text)
+    return sum(len(removed) for removed in _removal_rounds(cells, width))
+
+
+def _load_grid_numpy(input_text):
+    """Return the grid as a padded uint8 array (1 for a roll)."""
+    text = input_text.strip() + "\n"
+    width = text.index("\n") + 1
+    rows = np.frombuffer(text.encode(), dtype=np.uint8).reshape(-1, width)
+    grid = np.zeros((rows.shape[0] + 2, width + 1), dtype=np.uint8)
+    grid[1:-1, 1:-1] = rows[:, :-1] == ord("@")
+    return grid
+
+
+def _neighbour_counts_numpy(grid):
+    """Count the rolls around every inner cell as a sum of 8 shifted views."""
+    rows, cols = grid.shape[0] - 2, grid.shape[1] - 2
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if dr != 1 or dc != 1:
+                counts += grid[dr : dr + rows, dc : dc + cols]
+    return counts
+
+
+def solve_part1_numpy(input_text):
+    """Vectorized ``solve_part1``; falls back to it without NumPy."""
+    if np is None:
+        return solve_part1(input_text)
+
+    grid = _load_grid_numpy(input_text)
+    rolls = grid[1:-1, 1:-1].astype(bool)
+    return int(np.count_nonzero(rolls & (_neighbour_counts_numpy(grid) < 4)))
+
+
+def solve_part2_numpy(input_text):
+    """Vectorized ``solve_part2``; falls back to it without NumPy."""
+    if np is None:
+        return solve_part2(input_text)
+
+    grid = _load_grid_numpy(input_text)
+    inner = grid[1:-1, 1:-1]
+    total_removed = 0
+    while True:
+        accessible = inner.astype(bool) & (_neighbour_counts_numpy(grid) < 4)
+        removed = int(np.count_nonzero(accessible))
+        if not removed:
+            break
+        inner[accessible] = 0
+        total_removed += removed
+    return total_removed
+
+
+def removal_rounds(input_text):
+    """Return the round in which every roll is removed by the Part 2 cascade.
+
+    Returns ``(rounds, per_round)``: ``rounds`` is a row-major ``array("H")``
+    with one entry per cell holding the 1-based removal round (0 for empty
+    cells and rolls that are never removed), and ``per_round[k]`` is the number
+    of rolls removed in round ``k + 1``. Runs in the same single worklist pass
+    as ``solve_part2_worklist``.
+    """
+    cells, width = _padded_grid(input_text)
+    cols = width - 2
+    rows = len(cells) // width - 2
+    rounds = array("H", bytes(2 * rows * cols))
+    per_round = []
+    for round_number, removed in enumerate(_removal_rounds(cells, width), 1):
+        for i in removed:
+            r, c = divmod(i, width)
+            rounds[(r - 1) * cols + c - 1] = round_number
+        per_round.append(len(removed))
+    return rounds, per_round
+
+
+_BITBOARD_TABLE = str.maketrans("@.", "10")
+
+
+def _row_bitboards(input_text):
+    """Return every row as an int with bit ``c`` set for a roll in column c."""
+    lines = input_text.strip().split("\n")
+    return [int(line[::-1].translate(_BITBOARD_TABLE), 2) for line in lines]
+
+
+def _accessible_bits(above, row, below):
+    """Return the bits of ``row`` whose rolls have fewer than 4 neighbours.
+
+    The 8 neighbour planes are shifted copies of the three rows and are summed
+    per bit with a bit-sliced ripple adder (``s0``..``s3`` hold the binary
+    digits of every cell's count), so one big-int operation handles a whole
+    row. Bits shifted past either edge never meet a roll of ``row``.
+    """
+    s0 = s1 = s2 = s3 = 0
+    for plane in (
+        above << 1,
+        above,
+        above >> 1,
+        row << 1,
+        row >> 1,
+        below << 1,
+        below,
+        below >> 1,
+    ):
+        carry0 = s0 & plane
+        s0 ^= plane
+        carry1 = s1 & carry0
+        s1 ^= carry0
+        s3 |= s2 & carry1
+        s2 ^= carry1
+    return row & ~(s2 | s3)
+
+
+def solve_part1_bitboard(input_text):
+    """Same result as ``solve_part1`` using one int per row."""
+    boards = _row_bitboards(input_text)
+    padded = [0] + boards + [0]
+    return sum(
+        _accessible_bits(padded[r - 1], padded[r], padded[r + 1]).bit_count()
+        for r in range(1, len(padded) - 1)
+    )
+
+
+def solve_part2_bitboard(input_text):
+    """Same result as ``solve_part2`` using one int per row.
+
+    Each round recomputes only the rows next to a row that changed in the
+    previous round, then removes all accessible rolls at once.
+    """
+    padded = [0] + _row_bitboards(input_text) + [0]
+    total_removed = 0
+    candidates = range(1, len(padded) - 1)
+    while True:
+        removals = []
+        for r in candidates:
+            accessible = _accessible_bits(padded[r - 1], padded[r], padded[r + 1])
+            if accessible:
+                removals.append((r, accessible))
+        if not removals:
+            return total_removed
+
+        changed = set()
+        for r, accessible in removals:
+            padded[r] &= ~accessible
+            total_removed += accessible.bit_count()
+            changed.update((r - 1, r, r + 1))
+        candidates = sorted(r for r in changed if 0 < r < len(padded) - 1)
+
+
+class AccessibilityGrid:
+    """Grid of rolls that keeps the Part 1 answer current under edits.
+
+    Every cell stores how many rolls surround it, and ``accessible`` is the
+    number of rolls with fewer than 4 neighbours. ``add`` and ``remove`` only
+    touch the edited cell and its 8 neighbours, so both run in ``O(1)``.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.width = cols + 2
+        self.cells = bytearray(self.width * (rows + 2))
+        self.counts = bytearray(len(self.cells))
+        self.accessible = 0
+        w = self.width
+        self.offsets = (-w - 1, -w, -w + 1, -1, 1, w - 1, w, w + 1)
+
+    @classmethod
+    def from_text(cls, input_text):
+        lines = input_text.strip().split("\n")
+        grid = cls(len(lines), len(lines[0]))
+        for r, line in enumerate(lines):
+            for c, ch in enumerate(line):
+                if ch == "@":
+                    grid.add(r, c)
+        return grid
+
+    def _index(self, r, c):
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError(f"cell ({r}, {c}) is outside the grid")
+        return (r + 1) * self.width + c + 1
+
+    def __contains__(self, cell):
+        return bool(self.cells[self._index(*cell)])
+
+    def is_accessible(self, r, c):
+        i = self._index(r, c)
+        return bool(self.cells[i]) and self.counts[i] < 4
+
+    def add(self, r, c):
+        """Place a roll at ``(r, c)`` (no-op if there already is one)."""
+        i = self._index(r, c)
+        cells, counts = self.cells, self.counts
+        if cells[i]:
+            return
+        cells[i] = 1
+        if counts[i] < 4:
+            self.accessible += 1
+        for offset in self.offsets:
+            j = i + offset
+            counts[j] += 1
+            if cells[j] and counts[j] == 4:
+                self.accessible -= 1
+
+    def remove(self, r, c):
+        """Take away the roll at ``(r, c)`` (no-op if the cell is empty)."""
+        i = self._index(r, c)
+        cells, counts = self.cells, self.counts
+        if not cells[i]:
+            return
+        cells[i] = 0
+        if counts[i] < 4:
+            self.accessible -= 1
+        for offset in self.offsets:
+            j = i + offset
+            counts[j] -= 1
+            if cells[j] and counts[j] == 3:
+                self.accessible += 1
+
+
+def _grid_layout(path):
+    """Return ``(rows, cols)`` of a grid file with equal-length lines.
+
+    Only the first line and the file size are looked at here; ``_read_row``
+    checks every other row when a band worker reads it.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        cols = len(f.readline().rstrip(b"\n"))
+    stride = cols + 1
+    rows, rest = divmod(size + 1, stride)
+    if cols == 0 or rest not in (0, 1):
+        raise ValueError(f"{path} is not a grid of equal-length lines")
+    return rows, cols
+
+
+def _band_removals(band, above, below):
+    """Return ``(row, col)`` of the accessible rolls inside a band of rows.
+
+    ``above`` and ``below`` are the halo rows next to the band (``None`` at
+    the grid edges); only rolls of the band itself are reported.
+    """
+    roll = ord("@")
+    rows = [above] + band + [below]
+    accessible = []
+    for r in range(1, len(rows) - 1):
+        row = rows[r]
+        cols = len(row)
+        for c in range(cols):
+            if row[c] != roll:
+                continue
+            lo, hi = max(c - 1, 0), min(c + 2, cols)
+            adjacent_rolls = row[lo:hi].count(roll) - 1
+            for neighbour in (rows[r - 1], rows[r + 1]):
+                if neighbour is not None:
+                    adjacent_rolls += neighbour[lo:hi].count(roll)
+            if adjacent_rolls < 4:
+                accessible.append((r - 1, c))
+    return accessible
+
+
+def _read_row(data, r, cols):
+    offset = r * (cols + 1)
+    row = data[offset : offset + cols]
+    if b"\n" in row or data[offset + cols : offset + cols + 1] not in (b"\n", b""):
+        raise ValueError(f"row {r} of the grid does not have {cols} columns")
+    return row
+
+
+def _read_rows(data, first, last, cols):
+    return [_read_row(data, r, cols) for r in range(first, last)]
+
+
+def _count_band(path, rows, cols, first, last):
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            band = _read_rows(data, first, last, cols)
+            above = _read_row(data, first - 1, cols) if first else None
+            below = _read_row(data, last, cols) if last < rows else None
+    return len(_band_removals(band, above, below))
+
+
+def _halo_offset(base, cols, num_bands, buffer, band, edge):
+    """Offset of a band's top (edge 0) or bottom (edge 1) row in a halo buffer."""
+    return base + ((buffer * num_bands + band) * 2 + edge) * cols
+
+
+def _peel_band(path, cols, first, last, band_index, base, num_bands):
+    """Run one round on a band in place and report which edge rows changed.
+
+    The halo rows are read from halo buffer 0 (the previous round's edges)
+    and the band's new edge rows are written to buffer 1.
+    """
+    stride = cols + 1
+
+    def halo(buffer, i, edge):
+        offset = _halo_offset(base, cols, num_bands, buffer, i, edge)
+        return data[offset : offset + cols]
+
+    with open(path, "r+b") as f:
+        with mmap.mmap(f.fileno(), 0) as data:
+            band = [bytearray(row) for row in _read_rows(data, first, last, cols)]
+            above = halo(0, band_index - 1, 1) if band_index > 0 else None
+            below = halo(0, band_index + 1, 0) if band_index + 1 < num_bands else None
+            removed = _band_removals(band, above, below)
+            for r, c in removed:
+                band[r][c] = ord(".")
+            for r in {r for r, _ in removed}:
+                offset = (first + r) * stride
+                data[offset : offset + cols] = band[r]
+
+            top_changed = band[0] != halo(0, band_index, 0)
+            bottom_changed = band[-1] != halo(0, band_index, 1)
+            offset = _halo_offset(base, cols, num_bands, 1, band_index, 0)
+            data[offset : offset + cols] = band[0]
+            data[offset + cols : offset + 2 * cols] = band[-1]
+    return len(removed), top_changed, bottom_changed
+
+
+def _bands(rows, band_rows):
+    return [
+        (first, min(first + band_rows, rows)) for first in range(0, rows, band_rows)
+    ]
+
+
+def solve_part1_tiled(path, band_rows=1024, workers=None):
+    """Solve Part 1 on a grid file in row bands with a one-row halo.
+
+    Every worker maps the file and only materializes its band plus the two
+    halo rows, so memory use is bounded by ``band_rows`` times the width.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    rows, cols = _grid_layout(path)
+    bands = _bands(rows, band_rows)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_count_band, path, rows, cols, first, last)
+            for first, last in bands
+        ]
+        return sum(future.result() for future in futures)
+
+
+def solve_part2_tiled(path, band_rows=1024, workers=None, scratch_dir=None):
+    """Solve Part 2 on a grid file in row bands, exchanging halos per round.
+
+    The cascade runs on a scratch copy of the file, created in scratch_dir
+    (by default next to the input, since the system temp directory may be
+    a small tmpfs that cannot hold a grid this size). Two halo buffers holding
+    the top and bottom row of every band are appended to the copy. In every
+    round each band reads its rows from the copy and its halo rows from the
+    first buffer (the previous round's edges, so all bands see the same grid
+    state), writes its removals back in place and its new edge rows to the
+    second buffer. Changed edges are copied back to the first buffer between
+    rounds, so the parent never holds more than one edge row at a time. Bands
+    are only revisited when they or one of their halos changed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    rows, cols = _grid_layout(path)
+    bands = _bands(rows, band_rows)
+
+    if scratch_dir is None:
+        scratch_dir = os.path.dirname(path) or "."
+    fd, work_path = tempfile.mkstemp(suffix=".grid", dir=scratch_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(path, work_path)
+        num_bands = len(bands)
+        # The halo buffers start right after the grid, whose last row always
+        # gets a newline so that it still reads as a complete row.
+        base = rows * (cols + 1)
+        with open(work_path, "r+b") as f:
+            f.truncate(base + 4 * num_bands * cols)
+            with mmap.mmap(f.fileno(), 0) as data:
+                data[base - 1 : base] = b"\n"
+                for i, (first, last) in enumerate(bands):
+                    offset = _halo_offset(base, cols, num_bands, 0, i, 0)
+                    data[offset : offset + cols] = _read_row(data, first, cols)
+                    data[offset + cols : offset + 2 * cols] = _read_row(
+                        data, last - 1, cols
+                    )
+
+        total_removed = 0
+        dirty = set(range(num_bands))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while dirty:
+                futures = {
+                    i: executor.submit(
+                        _peel_band, work_path, cols, *bands[i], i, base, num_bands
+                    )
+                    for i in sorted(dirty)
+                }
+
+                dirty = set()
+                for i, future in futures.items():
+                    removed, top_changed, bottom_changed = future.result()
+                    if not removed:
+                        continue
+                    total_removed += removed
+                    dirty.add(i)
+                    if i > 0 and top_changed:
+                        dirty.add(i - 1)
+                    if i + 1 < num_bands and bottom_changed:
+                        dirty.add(i + 1)
+
+                if dirty:
+                    with open(work_path, "r+b") as f:
+                        with mmap.mmap(f.fileno(), 0) as data:
+                            for i in futures:
+                                src = _halo_offset(base, cols, num_bands, 1, i, 0)
+                                dst = _halo_offset(base, cols, num_bands, 0, i, 0)
+                                data.move(dst, src, 2 * cols)
+    finally:
+        os.remove(work_path)
+
+    return total_removed
+
+
 if __name__ == "__main__":
     import sys
 
@@ -14,6 +14,20 @@ the individual ID list. This is solved by merging overlapping ranges and summing
 each merged range.
 """
 
+import hashlib
+import mmap
+import os
+import random
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 def parse_input(input_text):
     """Parse the input into ranges and ingredient IDs."""
@@ -82,6 +96,457 @@ def solve_part2(input_text):
     return total
 
 
+def count_fresh_sorted(merged_ranges, ids):
+    """Count fresh IDs with one linear sweep of the sorted IDs over the ranges."""
+    count = 0
+    i = 0
+    num_ranges = len(merged_ranges)
+
+    for id_val in sorted(ids):
+        while i < num_ranges and merged_ranges[i][1] < id_val:
+            i += 1
+        if i == num_ranges:
+            break
+        if merged_ranges[i][0] <= id_val:
+            count += 1
+
+    return count
+
+
+def fresh_mask_numpy(merged_ranges, ids):
+    """Return a boolean array telling which IDs fall into a merged range."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if not merged_ranges:
+        return np.zeros(len(ids), dtype=bool)
+
+    starts, ends = np.array(merged_ranges, dtype=np.int64).T
+    # Index of the last range starting at or before every ID
+    idx = np.searchsorted(starts, ids, side="right") - 1
+    return (idx >= 0) & (ends[np.maximum(idx, 0)] >= ids)
+
+
+def solve_part1_sorted(input_text):
+    """Same result as ``solve_part1`` using the sort-merge sweep."""
+    ranges, ids = parse_input(input_text)
+    return count_fresh_sorted(merge_ranges(ranges), ids)
+
+
+def solve_part1_numpy(input_text):
+    """Vectorized ``solve_part1``; falls back to it without NumPy."""
+    if np is None:
+        return solve_part1(input_text)
+
+    ranges, ids = parse_input(input_text)
+    return int(np.count_nonzero(fresh_mask_numpy(merge_ranges(ranges), ids)))
+
+
+def _read_range_section(f):
+    """Read ``start-end`` lines up to the blank separator line."""
+    ranges = []
+    for line in f:
+        line = line.strip()
+        if not line:
+            if ranges:
+                break
+            continue
+        start, end = map(int, line.split("-"))
+        ranges.append((start, end))
+    return ranges
+
+
+def _iter_id_chunks(f, chunk_size):
+    """Yield lists of IDs parsed from fixed-size reads of the ID section."""
+    rest = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        lines = (rest + chunk).split("\n")
+        rest = lines.pop()
+        yield [int(line) for line in lines if line.strip()]
+    if rest.strip():
+        yield [int(rest)]
+
+
+def solve_stream(source, chunk_size=1 << 20):
+    """Solve both parts while reading the ID section lazily.
+
+    ``source`` is a path or a text file object. Only the ranges are kept in
+    memory; the IDs are read ``chunk_size`` characters at a time and counted
+    per chunk with ``count_fresh_sorted``. Returns ``(part1, part2)``.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            return solve_stream(f, chunk_size)
+
+    merged = merge_ranges(_read_range_section(source))
+    part1 = 0
+    for ids in _iter_id_chunks(source, chunk_size):
+        part1 += count_fresh_sorted(merged, ids)
+    part2 = sum(end - start + 1 for start, end in merged)
+    return part1, part2
+
+
+class _RangeNode:
+    __slots__ = ("covered", "end", "left", "right", "size", "start")
+
+    def __init__(self, start, end, left=None, right=None):
+        self.start = start
+        self.end = end
+        self.left = left
+        self.right = right
+        self.update()
+
+    def update(self):
+        size = 1
+        covered = self.end - self.start + 1
+        for child in (self.left, self.right):
+            if child is not None:
+                size += child.size
+                covered += child.covered
+        self.size = size
+        self.covered = covered
+        return self
+
+
+def _build_ranges(ranges, lo, hi):
+    if lo >= hi:
+        return None
+    mid = (lo + hi) // 2
+    return _RangeNode(
+        *ranges[mid], _build_ranges(ranges, lo, mid), _build_ranges(ranges, mid + 1, hi)
+    )
+
+
+def _merge_nodes(left, right):
+    # Same size-weighted random merge as day01's rotation log.
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if random.randrange(left.size + right.size) < left.size:
+        left.right = _merge_nodes(left.right, right)
+        return left.update()
+    right.left = _merge_nodes(left, right.left)
+    return right.update()
+
+
+def _split_ends(node, key):
+    """Split into the ranges ending before ``key`` and the rest."""
+    if node is None:
+        return None, None
+    if node.end < key:
+        node.right, rest = _split_ends(node.right, key)
+        return node.update(), rest
+    first, node.left = _split_ends(node.left, key)
+    return first, node.update()
+
+
+def _split_starts(node, key):
+    """Split into the ranges starting at or before ``key`` and the rest."""
+    if node is None:
+        return None, None
+    if node.start <= key:
+        node.right, rest = _split_starts(node.right, key)
+        return node.update(), rest
+    first, node.left = _split_starts(node.left, key)
+    return first, node.update()
+
+
+def _leftmost(node):
+    while node.left is not None:
+        node = node.left
+    return node
+
+
+def _rightmost(node):
+    while node.right is not None:
+        node = node.right
+    return node
+
+
+class IntervalSet:
+    """Mutable set of integer IDs stored as disjoint inclusive ranges.
+
+    The ranges are kept sorted and coalesced (overlapping or adjacent ranges
+    are merged on insert, like ``merge_ranges``) in a randomly balanced tree
+    keyed by range start. An update splits off the ranges it touches and
+    merges the rest back, so updates and lookups take ``O(log n)`` expected
+    time. Every node caches the IDs covered by its subtree, which keeps
+    ``covered_size`` constant time.
+    """
+
+    def __init__(self, ranges=()):
+        merged = merge_ranges(list(ranges))
+        self.root = _build_ranges(merged, 0, len(merged))
+
+    def __iter__(self):
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end
+            node = node.right
+
+    def __len__(self):
+        return self.root.size if self.root is not None else 0
+
+    def __contains__(self, id_val):
+        return self.contains(id_val)
+
+    def add(self, start, end):
+        """Add the inclusive range ``[start, end]``."""
+        if start > end:
+            raise ValueError(f"invalid range {start}-{end}")
+        # Every range ending at or after start - 1 and starting at or before
+        # end + 1 overlaps or touches the new one and is folded into it.
+        before, rest = _split_ends(self.root, start - 1)
+        touched, after = _split_starts(rest, end + 1)
+        if touched is not None:
+            start = min(start, _leftmost(touched).start)
+            end = max(end, _rightmost(touched).end)
+        node = _RangeNode(start, end)
+        self.root = _merge_nodes(_merge_nodes(before, node), after)
+
+    def remove(self, start, end):
+        """Remove the inclusive range ``[start, end]``."""
+        if start > end:
+            raise ValueError(f"invalid range {start}-{end}")
+        before, rest = _split_ends(self.root, start)
+        touched, after = _split_starts(rest, end)
+        if touched is not None:
+            first = _leftmost(touched)
+            if first.start < start:
+                before = _merge_nodes(before, _RangeNode(first.start, start - 1))
+            last = _rightmost(touched)
+            if last.end > end:
+                after = _merge_nodes(_RangeNode(end + 1, last.end), after)
+        self.root = _merge_nodes(before, after)
+
+    def contains(self, id_val):
+        """Check whether ``id_val`` lies in any range."""
+        node = self.root
+        while node is not None:
+            if id_val < node.start:
+                node = node.left
+            elif id_val > node.end:
+                node = node.right
+            else:
+                return True
+        return False
+
+    def covered_size(self):
+        """Number of distinct IDs covered (the Part 2 answer)."""
+        return self.root.covered if self.root is not None else 0
+
+    def count_fresh(self, ids):
+        """Count the IDs that lie in any range (the Part 1 answer)."""
+        return sum(1 for id_val in ids if self.contains(id_val))
+
+
+# Index file layout (native byte order): header, then the range starts, the
+# range ends and the cumulative covered counts (one more entry than ranges).
+_INDEX_MAGIC = b"AOC25D05"
+_INDEX_HEADER = struct.Struct("=8sQ")
+
+
+class MergedRangeIndex:
+    """``merge_ranges`` output as packed arrays, optionally backed by a file.
+
+    ``starts[i]``/``ends[i]`` are the merged ranges and ``covered[i]`` is the
+    number of IDs covered by the first ``i`` ranges. The arrays are either
+    ``array("Q")`` objects or zero-copy views of a memory-mapped index file.
+    """
+
+    def __init__(self, starts, ends, covered, mapping=None):
+        self.starts = starts
+        self.ends = ends
+        self.covered = covered
+        self._mapping = mapping
+        self._numpy_arrays = None
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        merged = merge_ranges(ranges)
+        covered = array("Q", [0])
+        total = 0
+        for start, end in merged:
+            total += end - start + 1
+            covered.append(total)
+        starts = array("Q", (start for start, _ in merged))
+        ends = array("Q", (end for _, end in merged))
+        return cls(starts, ends, covered)
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map an index file written by ``save``."""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = count = None
+        if len(mapping) >= _INDEX_HEADER.size:
+            magic, count = _INDEX_HEADER.unpack_from(mapping)
+        if magic != _INDEX_MAGIC:
+            mapping.close()
+            raise ValueError(f"{path} is not a day05 index file")
+        if len(mapping) != _INDEX_HEADER.size + (3 * count + 1) * 8:
+            mapping.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+
+        views = []
+        offset = _INDEX_HEADER.size
+        for length in (count, count, count + 1):
+            views.append(memoryview(mapping)[offset : offset + length * 8].cast("Q"))
+            offset += length * 8
+        return cls(*views, mapping=mapping)
+
+    def save(self, path):
+        """Write the index atomically to ``path``.
+
+        The data goes to a uniquely named file in the same directory first, so
+        concurrent writers of the same path never share a temporary file.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, len(self.starts)))
+                for values in (self.starts, self.ends, self.covered):
+                    f.write(values)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def close(self):
+        self._numpy_arrays = None
+        if self._mapping is not None:
+            for view in (self.starts, self.ends, self.covered):
+                view.release()
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def contains(self, id_val):
+        i = bisect_right(self.starts, id_val) - 1
+        return i >= 0 and self.ends[i] >= id_val
+
+    def count_fresh(self, ids):
+        """Count the IDs that lie in any range (the Part 1 answer)."""
+        return sum(1 for id_val in ids if self.contains(id_val))
+
+    def covered_size(self):
+        """Number of distinct IDs covered (the Part 2 answer)."""
+        return self.covered[-1]
+
+    def _count_up_to(self, id_val):
+        i = bisect_right(self.starts, id_val) - 1
+        if i < 0:
+            return 0
+        return self.covered[i] + min(id_val, self.ends[i]) - self.starts[i] + 1
+
+    def count_between(self, low, high):
+        """Count the fresh IDs in ``[low, high]`` in ``O(log R)``."""
+        if high < low:
+            return 0
+        return self._count_up_to(high) - self._count_up_to(low - 1)
+
+    def kth(self, k):
+        """Return the k-th smallest fresh ID (1-based) in ``O(log R)``."""
+        if not 1 <= k <= self.covered_size():
+            raise IndexError("k is out of range")
+        # The range holding it is the last one with fewer than k IDs before it
+        i = bisect_left(self.covered, k) - 1
+        return self.starts[i] + k - self.covered[i] - 1
+
+    def _arrays_numpy(self):
+        # Converted once per index and reused by every batch query.
+        if self._numpy_arrays is None:
+            self._numpy_arrays = tuple(
+                np.frombuffer(values, dtype=np.uint64).astype(np.int64)
+                for values in (self.starts, self.ends, self.covered)
+            )
+        return self._numpy_arrays
+
+    def count_between_many(self, lows, highs):
+        """Answer ``count_between`` for many ranges at once.
+
+        Uses vectorized ``searchsorted`` lookups when NumPy is available.
+        IDs must fit into a signed 64-bit integer on that path.
+        """
+        if np is None or not len(self.starts):
+            return [self.count_between(low, high) for low, high in zip(lows, highs)]
+
+        starts, ends, covered = self._arrays_numpy()
+
+        def count_up_to(ids):
+            idx = np.searchsorted(starts, ids, side="right") - 1
+            safe = np.maximum(idx, 0)
+            counts = covered[safe] + np.minimum(ids, ends[safe]) - starts[safe] + 1
+            return np.where(idx >= 0, counts, 0)
+
+        lows = np.asarray(lows, dtype=np.int64)
+        highs = np.asarray(highs, dtype=np.int64)
+        counts = count_up_to(highs) - count_up_to(lows - 1)
+        return np.where(highs >= lows, counts, 0).tolist()
+
+    def kth_many(self, ks):
+        """Answer ``kth`` for many ks at once (vectorized with NumPy)."""
+        if np is None:
+            return [self.kth(k) for k in ks]
+
+        starts, _, covered = self._arrays_numpy()
+        ks = np.asarray(ks, dtype=np.int64)
+        if len(ks) and (ks.min() < 1 or ks.max() > self.covered_size()):
+            raise IndexError("k is out of range")
+        idx = np.searchsorted(covered, ks, side="left") - 1
+        return (starts[idx] + ks - covered[idx] - 1).tolist()
+
+
+def load_index(range_text, cache_dir):
+    """Return the merged-range index for a range section, using a disk cache.
+
+    The cache file is keyed by a SHA-256 hash of the range section. On a hit
+    the file is memory-mapped and neither parsing nor merging happens; on a
+    miss (or if the cached file is damaged) the ranges are parsed, merged and
+    written to the cache first.
+    """
+    range_text = range_text.strip()
+    key = hashlib.sha256(range_text.encode()).hexdigest()
+    path = os.path.join(cache_dir, f"day05-{key}.idx")
+    if os.path.exists(path):
+        try:
+            return MergedRangeIndex.open(path)
+        except ValueError:
+            # A damaged cache file is rebuilt below like a cache miss
+            os.remove(path)
+
+    ranges = []
+    for line in range_text.split("\n"):
+        start, end = map(int, line.split("-"))
+        ranges.append((start, end))
+    os.makedirs(cache_dir, exist_ok=True)
+    MergedRangeIndex.from_ranges(ranges).save(path)
+    return MergedRangeIndex.open(path)
+
+
+def solve_cached(input_text, cache_dir):
+    """Solve both parts with the range section served from the index cache."""
+    range_text, id_text = input_text.strip().split("\n\n", 1)
+    ids = [int(line) for line in id_text.strip().split("\n")]
+    with load_index(range_text, cache_dir) as index:
+        return index.count_fresh(ids), index.covered_size()
+
+
 if __name__ == "__main__":
     import sys
 